@@ -29,27 +29,53 @@ from nexusproto.serialization import from_shaped_array
 
 INIT_LOCK = Lock(ctx=None)
 
+# Number of tile ids bound to each SELECT ... IN query
+FETCH_BATCH_SIZE = 100
+
 logger = logging.getLogger(__name__)
 
+
+def _mask_nan(data_array):
+    """
+    Wrap a freshly decoded array in a masked array, masking NaN values.
+    Decoded tile data marks missing values with NaN only, so this skips
+    the extra infinity test and data copy done by np.ma.masked_invalid.
+    Non floating point arrays cannot hold NaN and get an all False mask.
+
+    :param data_array: Array decoded from a tile
+    :type data_array: np.array
+    :return: Masked view of the array
+    :rtype: np.ma.MaskedArray
+    """
+    if data_array.dtype.kind != 'f':
+        return np.ma.MaskedArray(data_array, mask=False, copy=False)
+
+    return np.ma.MaskedArray(data_array, mask=np.isnan(data_array), copy=False)
+
+
 class NexusTileData(Model):
     __table_name__ = 'sea_surface_temp'
     tile_id = columns.UUID(primary_key=True)
     tile_blob = columns.Blob()
 
-    __nexus_tile = None
+    def __init__(self, **values):
+        super().__init__(**values)
+        self.__nexus_tile = None
 
     def _get_nexus_tile(self):
         if self.__nexus_tile is None:
-            self.__nexus_tile = nexusproto.TileData.FromString(self.tile_blob)
+            nexus_tile = nexusproto.TileData()
+            nexus_tile.ParseFromString(self.tile_blob)
+            self.__nexus_tile = nexus_tile
 
         return self.__nexus_tile
 
     def get_raw_data_array(self):
 
         nexus_tile = self._get_nexus_tile()
-        the_tile_type = nexus_tile.tile.WhichOneof("tile_type")
+        the_tile_type = nexus_tile.WhichOneof("tile_type")
 
-        the_tile_data = getattr(nexus_tile.tile, the_tile_type)
+        the_tile_data = getattr(nexus_tile, the_tile_type)
 
         return from_shaped_array(the_tile_data.variable_data)
 
@@ -79,12 +105,15 @@ class NexusTileData(Model):
         """
         is_multi_var = False
 
-        if self._get_nexus_tile().HasField('grid_tile'):
-            grid_tile = self._get_nexus_tile().grid_tile
+        nexus_tile = self._get_nexus_tile()
+        tile_type = nexus_tile.WhichOneof("tile_type")
 
-            grid_tile_data = np.ma.masked_invalid(from_shaped_array(grid_tile.variable_data))
-            latitude_data = np.ma.masked_invalid(from_shaped_array(grid_tile.latitude))
-            longitude_data = np.ma.masked_invalid(from_shaped_array(grid_tile.longitude))
+        if tile_type == 'grid_tile':
+            grid_tile = nexus_tile.grid_tile
+
+            grid_tile_data = _mask_nan(from_shaped_array(grid_tile.variable_data))
+            latitude_data = _mask_nan(from_shaped_array(grid_tile.latitude))
+            longitude_data = _mask_nan(from_shaped_array(grid_tile.longitude))
 
             if len(grid_tile_data.shape) == 2:
                 grid_tile_data = grid_tile_data[np.newaxis, :]
@@ -93,24 +122,24 @@ class NexusTileData(Model):
             meta_data = {}
             for meta_data_obj in grid_tile.meta_data:
                 name = meta_data_obj.name
-                meta_array = np.ma.masked_invalid(from_shaped_array(meta_data_obj.meta_data))
+                meta_array = _mask_nan(from_shaped_array(meta_data_obj.meta_data))
                 if len(meta_array.shape) == 2:
                     meta_array = meta_array[np.newaxis, :]
                 meta_data[name] = meta_array
 
             return latitude_data, longitude_data, np.array([grid_tile.time]), grid_tile_data, meta_data, is_multi_var
-        elif self._get_nexus_tile().HasField('swath_tile'):
-            swath_tile = self._get_nexus_tile().swath_tile
+        elif tile_type == 'swath_tile':
+            swath_tile = nexus_tile.swath_tile
 
-            latitude_data = np.ma.masked_invalid(from_shaped_array(swath_tile.latitude)).reshape(-1)
-            longitude_data = np.ma.masked_invalid(from_shaped_array(swath_tile.longitude)).reshape(-1)
-            time_data = np.ma.masked_invalid(from_shaped_array(swath_tile.time)).reshape(-1)
+            latitude_data = _mask_nan(from_shaped_array(swath_tile.latitude)).reshape(-1)
+            longitude_data = _mask_nan(from_shaped_array(swath_tile.longitude)).reshape(-1)
+            time_data = _mask_nan(from_shaped_array(swath_tile.time)).reshape(-1)
 
             # Simplify the tile if the time dimension is the same value repeated
             if np.all(time_data == np.min(time_data)):
                 time_data = np.array([np.min(time_data)])
 
-            swath_tile_data = np.ma.masked_invalid(from_shaped_array(swath_tile.variable_data))
+            swath_tile_data = _mask_nan(from_shaped_array(swath_tile.variable_data))
 
             tile_data = self._to_standard_index(swath_tile_data,
                                                 (len(time_data), len(latitude_data), len(longitude_data)))
@@ -119,49 +148,45 @@ class NexusTileData(Model):
             meta_data = {}
             for meta_data_obj in swath_tile.meta_data:
                 name = meta_data_obj.name
-                actual_meta_array = np.ma.masked_invalid(from_shaped_array(meta_data_obj.meta_data))
+                actual_meta_array = _mask_nan(from_shaped_array(meta_data_obj.meta_data))
                 reshaped_meta_array = self._to_standard_index(actual_meta_array, tile_data.shape)
                 meta_data[name] = reshaped_meta_array
 
             return latitude_data, longitude_data, time_data, tile_data, meta_data, is_multi_var
-        elif self._get_nexus_tile().HasField('time_series_tile'):
-            time_series_tile = self._get_nexus_tile().time_series_tile
+        elif tile_type == 'time_series_tile':
+            time_series_tile = nexus_tile.time_series_tile
 
-            time_series_tile_data = np.ma.masked_invalid(from_shaped_array(time_series_tile.variable_data))
-            time_data = np.ma.masked_invalid(from_shaped_array(time_series_tile.time)).reshape(-1)
-            latitude_data = np.ma.masked_invalid(from_shaped_array(time_series_tile.latitude))
-            longitude_data = np.ma.masked_invalid(from_shaped_array(time_series_tile.longitude))
+            time_series_tile_data = _mask_nan(from_shaped_array(time_series_tile.variable_data))
+            time_data = _mask_nan(from_shaped_array(time_series_tile.time)).reshape(-1)
+            latitude_data = _mask_nan(from_shaped_array(time_series_tile.latitude))
+            longitude_data = _mask_nan(from_shaped_array(time_series_tile.longitude))
 
-            reshaped_array = np.ma.masked_all((len(time_data), len(latitude_data), len(longitude_data)))
+            desired_shape = (len(time_data), len(latitude_data), len(longitude_data))
             idx = np.arange(len(latitude_data))
-            reshaped_array[:, idx, idx] = time_series_tile_data
-            tile_data = reshaped_array
+
+            tile_data = self._to_time_series_index(time_series_tile_data, desired_shape, idx)
             # Extract the meta data
             meta_data = {}
             for meta_data_obj in time_series_tile.meta_data:
                 name = meta_data_obj.name
-                meta_array = np.ma.masked_invalid(from_shaped_array(meta_data_obj.meta_data))
-
-                reshaped_meta_array = np.ma.masked_all((len(time_data), len(latitude_data), len(longitude_data)))
-                idx = np.arange(len(latitude_data))
-                reshaped_meta_array[:, idx, idx] = meta_array
+                meta_array = _mask_nan(from_shaped_array(meta_data_obj.meta_data))
 
-                meta_data[name] = reshaped_meta_array
+                meta_data[name] = self._to_time_series_index(meta_array, desired_shape, idx)
 
             return latitude_data, longitude_data, time_data, tile_data, meta_data, is_multi_var
-        elif self._get_nexus_tile().HasField('swath_multi_variable_tile'):
-            swath_tile = self._get_nexus_tile().swath_multi_variable_tile
+        elif tile_type == 'swath_multi_variable_tile':
+            swath_tile = nexus_tile.swath_multi_variable_tile
             is_multi_var = True
 
-            latitude_data = np.ma.masked_invalid(from_shaped_array(swath_tile.latitude)).reshape(-1)
-            longitude_data = np.ma.masked_invalid(from_shaped_array(swath_tile.longitude)).reshape(-1)
-            time_data = np.ma.masked_invalid(from_shaped_array(swath_tile.time)).reshape(-1)
+            latitude_data = _mask_nan(from_shaped_array(swath_tile.latitude)).reshape(-1)
+            longitude_data = _mask_nan(from_shaped_array(swath_tile.longitude)).reshape(-1)
+            time_data = _mask_nan(from_shaped_array(swath_tile.time)).reshape(-1)
 
             # Simplify the tile if the time dimension is the same value repeated
             if np.all(time_data == np.min(time_data)):
                 time_data = np.array([np.min(time_data)])
 
-            swath_tile_data = np.ma.masked_invalid(from_shaped_array(swath_tile.variable_data))
+            swath_tile_data = _mask_nan(from_shaped_array(swath_tile.variable_data))
 
             desired_shape = (
                 len(time_data),
@@ -174,18 +199,18 @@ class NexusTileData(Model):
             meta_data = {}
             for meta_data_obj in swath_tile.meta_data:
                 name = meta_data_obj.name
-                actual_meta_array = np.ma.masked_invalid(from_shaped_array(meta_data_obj.meta_data))
+                actual_meta_array = _mask_nan(from_shaped_array(meta_data_obj.meta_data))
                 reshaped_meta_array = self._to_standard_index(actual_meta_array, tile_data.shape)
                 meta_data[name] = reshaped_meta_array
 
             return latitude_data, longitude_data, time_data, tile_data, meta_data, is_multi_var
-        elif self._get_nexus_tile().HasField('grid_multi_variable_tile'):
-            grid_multi_variable_tile = self._get_nexus_tile().grid_multi_variable_tile
+        elif tile_type == 'grid_multi_variable_tile':
+            grid_multi_variable_tile = nexus_tile.grid_multi_variable_tile
             is_multi_var = True
 
-            grid_tile_data = np.ma.masked_invalid(from_shaped_array(grid_multi_variable_tile.variable_data))
-            latitude_data = np.ma.masked_invalid(from_shaped_array(grid_multi_variable_tile.latitude))
-            longitude_data = np.ma.masked_invalid(from_shaped_array(grid_multi_variable_tile.longitude))
+            grid_tile_data = _mask_nan(from_shaped_array(grid_multi_variable_tile.variable_data))
+            latitude_data = _mask_nan(from_shaped_array(grid_multi_variable_tile.latitude))
+            longitude_data = _mask_nan(from_shaped_array(grid_multi_variable_tile.longitude))
 
             # If there are 3 dimensions, that means the time dimension
             # was squeezed. Add back in
@@ -200,7 +225,7 @@ class NexusTileData(Model):
             meta_data = {}
             for meta_data_obj in grid_multi_variable_tile.meta_data:
                 name = meta_data_obj.name
-                meta_array = np.ma.masked_invalid(from_shaped_array(meta_data_obj.meta_data))
+                meta_array = _mask_nan(from_shaped_array(meta_data_obj.meta_data))
                 if len(meta_array.shape) == 2:
                     meta_array = meta_array[np.newaxis, :]
                 meta_data[name] = meta_array
@@ -209,6 +234,28 @@ class NexusTileData(Model):
         else:
             raise NotImplementedError("Only supports grid_tile, swath_tile, swath_multi_variable_tile, and time_series_tile")
 
+    @staticmethod
+    def _to_time_series_index(data_array, desired_shape, idx):
+        """
+        Place time series data along the lat/lon diagonal of a masked
+        (time, lat, lon) array. The data and mask buffers are written
+        directly, bypassing masked array item assignment.
+
+        :param data_array: The (time, point) data array to be transformed
+        :param desired_shape: The (time, lat, lon) shape of the resulting array
+        :param idx: Diagonal indices, one per point
+        :type data_array: np.ma.MaskedArray
+        :type desired_shape: tuple
+        :type idx: np.array
+        :return: Reshaped array
+        :rtype: np.ma.MaskedArray
+        """
+        reshaped_array = np.ma.masked_all(desired_shape)
+        reshaped_array.data[:, idx, idx] = np.ma.getdata(data_array)
+        reshaped_array.mask[:, idx, idx] = np.ma.getmaskarray(data_array)
+
+        return reshaped_array
+
     @staticmethod
     def _to_standard_index(data_array, desired_shape, is_multi_var=False):
         """
@@ -235,19 +282,15 @@ class NexusTileData(Model):
         for variable_data_array in reshaped_data_array:
             if desired_shape[0] == 1:
                 variable_reshaped_array = np.ma.masked_all((desired_shape[1], desired_shape[2]))
+                diagonal = 'ii->i'
             else:
                 variable_reshaped_array = np.ma.masked_all(desired_shape)
+                diagonal = 'iii->i'
 
-            row, col = np.indices(variable_data_array.shape)
-
-            variable_reshaped_array[
-                np.diag_indices(desired_shape[1], len(variable_reshaped_array.shape))] = \
-                variable_data_array[
-                    row.flat, col.flat]
-            variable_reshaped_array.mask[
-                np.diag_indices(desired_shape[1], len(variable_reshaped_array.shape))] = \
-                variable_data_array.mask[
-                    row.flat, col.flat]
+            # einsum returns writable views of the diagonal, so the swath
+            # points can be copied in without building full index grids
+            np.einsum(diagonal, variable_reshaped_array.data)[:] = np.ma.getdata(variable_data_array).ravel()
+            np.einsum(diagonal, variable_reshaped_array.mask)[:] = np.ma.getmaskarray(variable_data_array).ravel()
 
             if desired_shape[0] == 1:
                 reshaped_array.append(variable_reshaped_array[np.newaxis, :])
@@ -262,6 +305,8 @@ class NexusTileData(Model):
 
 
 class CassandraProxy(object):
+    __select_statement = None
+
     def __init__(self, config):
         self.config = config
         self.__cass_url = config.get("cassandra", "host")
@@ -304,14 +349,32 @@ class CassandraProxy(object):
         except NoHostAvailable as e:
             logger.error("Cassandra is not accessible, SDAP will not server local datasets", e)
 
+    @staticmethod
+    def __get_select_statement(session):
+        if CassandraProxy.__select_statement is None:
+            with INIT_LOCK:
+                if CassandraProxy.__select_statement is None:
+                    CassandraProxy.__select_statement = session.prepare(
+                        "SELECT tile_id, tile_blob FROM %s WHERE tile_id IN ?" % NexusTileData.column_family_name()
+                    )
+
+        return CassandraProxy.__select_statement
+
     def fetch_nexus_tiles(self, *tile_ids):
-        tile_ids = [uuid.UUID(str(tile_id)) for tile_id in tile_ids if
-                    (isinstance(tile_id, str) or isinstance(tile_id, str))]
+        tile_ids = [uuid.UUID(str(tile_id)) for tile_id in tile_ids if isinstance(tile_id, str)]
+
+        session = connection.get_session()
+        statement = CassandraProxy.__get_select_statement(session)
+
+        # Issue all batches up front so their round trips overlap
+        futures = [
+            session.execute_async(statement, [tile_ids[i:i + FETCH_BATCH_SIZE]])
+            for i in range(0, len(tile_ids), FETCH_BATCH_SIZE)
+        ]
 
-        res = []
-        for tile_id in tile_ids:
-            filterResults = NexusTileData.objects.filter(tile_id=tile_id)
-            if len(filterResults) > 0:
-                res.append(filterResults[0])
+        blobs = {}
+        for future in futures:
+            for row in future.result():
+                blobs[row['tile_id']] = row['tile_blob']
 
-        return res
+        return [NexusTileData(tile_id=tile_id, tile_blob=blobs[tile_id]) for tile_id in tile_ids if tile_id in blobs]
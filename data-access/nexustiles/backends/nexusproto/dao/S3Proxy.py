@@ -101,21 +101,15 @@ class NexusTileData(object):
 
         if desired_shape[0] == 1:
             reshaped_array = np.ma.masked_all((desired_shape[1], desired_shape[2]))
-            row, col = np.indices(data_array.shape)
-
-            reshaped_array[np.diag_indices(desired_shape[1], len(reshaped_array.shape))] = data_array[
-                row.flat, col.flat]
-            reshaped_array.mask[np.diag_indices(desired_shape[1], len(reshaped_array.shape))] = data_array.mask[
-                row.flat, col.flat]
+            reshaped_array[np.diag_indices(desired_shape[1], len(reshaped_array.shape))] = data_array.ravel()
+            reshaped_array.mask[np.diag_indices(desired_shape[1], len(reshaped_array.shape))] = \
+                np.ma.getmaskarray(data_array).ravel()
             reshaped_array = reshaped_array[np.newaxis, :]
         else:
             reshaped_array = np.ma.masked_all(desired_shape)
-            row, col = np.indices(data_array.shape)
-
-            reshaped_array[np.diag_indices(desired_shape[1], len(reshaped_array.shape))] = data_array[
-                row.flat, col.flat]
-            reshaped_array.mask[np.diag_indices(desired_shape[1], len(reshaped_array.shape))] = data_array.mask[
-                row.flat, col.flat]
+            reshaped_array[np.diag_indices(desired_shape[1], len(reshaped_array.shape))] = data_array.ravel()
+            reshaped_array.mask[np.diag_indices(desired_shape[1], len(reshaped_array.shape))] = \
+                np.ma.getmaskarray(data_array).ravel()
 
         return reshaped_array
 
@@ -18,8 +18,10 @@ import logging
 import threading
 import time
 from datetime import datetime
+from functools import lru_cache
 from pytz import timezone, UTC
 
+import numpy as np
 import requests
 import pysolr
 from shapely import wkt
@@ -30,6 +32,13 @@ thread_local = threading.local()
 EPOCH = timezone('UTC').localize(datetime(1970, 1, 1))
 SOLR_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
 ISO_8601 = '%Y-%m-%dT%H:%M:%S%z'
+EPOCH_64 = np.datetime64(0, 's')
+
+
+@lru_cache(maxsize=1024)
+def _to_solr_time(timestamp):
+    """Format seconds since epoch as a Solr date string."""
+    return datetime.utcfromtimestamp(timestamp).strftime(SOLR_FORMAT)
 
 
 class SolrProxy(object):
@@ -131,30 +140,24 @@ class SolrProxy(object):
     def find_min_max_date_from_granule(self, ds, granule_name, **kwargs):
         search = 'dataset_s:%s' % ds
 
-        kwargs['rows'] = 1
-        kwargs['fl'] = 'tile_min_time_dt'
-        kwargs['sort'] = ['tile_min_time_dt asc']
+        kwargs['rows'] = 0
         additionalparams = {
             'fq': [
                 "granule_s:%s" % granule_name
+            ],
+            'stats': 'true',
+            'stats.field': [
+                '{!min=true max=false}tile_min_time_dt',
+                '{!min=false max=true}tile_max_time_dt'
             ]
         }
 
         self._merge_kwargs(additionalparams, **kwargs)
-        results, start, found = self.do_query(*(search, None, None, False, None), **additionalparams)
-        start_time = self.convert_iso_to_datetime(results[0]['tile_min_time_dt'])
-
-        kwargs['fl'] = 'tile_max_time_dt'
-        kwargs['sort'] = ['tile_max_time_dt desc']
-        additionalparams = {
-            'fq': [
-                "granule_s:%s" % granule_name
-            ]
-        }
+        response = self.do_query_raw(*(search, None, None, False, None), **additionalparams)
 
-        self._merge_kwargs(additionalparams, **kwargs)
-        results, start, found = self.do_query(*(search, None, None, False, None), **additionalparams)
-        end_time = self.convert_iso_to_datetime(results[0]['tile_max_time_dt'])
+        stats_fields = response.stats['stats_fields']
+        start_time = self.convert_iso_to_datetime(stats_fields['tile_min_time_dt']['min'])
+        end_time = self.convert_iso_to_datetime(stats_fields['tile_max_time_dt']['max'])
 
         return start_time, end_time
 
@@ -162,39 +165,37 @@ class SolrProxy(object):
 
         datasets = self.get_data_series_list_simple()
 
-        def get_spatial_bound(dataset, lat_lon, min_max):
-            search = f'dataset_s:{dataset}'
-
-            field = f'tile_{min_max}_{lat_lon}'
-
-            order = 'ASC' if min_max == 'min' else 'DESC'
-
-            params = dict(
-                rows=1,
-                sort=[f'{field} {order}']
-            )
-
-            results = self.do_query_raw(*(search, None, None, False, None), **params)
-
-            v = results.docs[0][field]
+        # Temporal and spatial bounds for each dataset come back from a single stats request
+        params = {
+            'rows': 0,
+            'stats': 'true',
+            'stats.field': [
+                '{!min=true max=false}tile_min_time_dt',
+                '{!min=false max=true}tile_max_time_dt',
+                '{!min=true max=false}tile_min_lat',
+                '{!min=false max=true}tile_max_lat',
+                '{!min=true max=false}tile_min_lon',
+                '{!min=false max=true}tile_max_lon'
+            ]
+        }
 
-            if isinstance(v, list):
-                v = v[0]
+        for dataset in datasets:
+            search = f'dataset_s:{dataset["title"]}'
 
-            return v
+            response = self.do_query_raw(*(search, None, None, False, None), **params)
+            stats_fields = response.stats['stats_fields']
 
-        for dataset in datasets:
-            min_date = self.find_min_date_from_tiles([], ds=dataset['title'])
-            max_date = self.find_max_date_from_tiles([], ds=dataset['title'])
+            min_date = self.convert_iso_to_datetime(stats_fields['tile_min_time_dt']['min'])
+            max_date = self.convert_iso_to_datetime(stats_fields['tile_max_time_dt']['max'])
             dataset['start'] = (min_date - EPOCH).total_seconds()
             dataset['end'] = (max_date - EPOCH).total_seconds()
             dataset['iso_start'] = min_date.strftime(ISO_8601)
             dataset['iso_end'] = max_date.strftime(ISO_8601)
 
-            min_lat = get_spatial_bound(dataset['title'], 'lat', 'min')
-            max_lat = get_spatial_bound(dataset['title'], 'lat', 'max')
-            min_lon = get_spatial_bound(dataset['title'], 'lon', 'min')
-            max_lon = get_spatial_bound(dataset['title'], 'lon', 'max')
+            min_lat = stats_fields['tile_min_lat']['min']
+            max_lat = stats_fields['tile_max_lat']['max']
+            min_lon = stats_fields['tile_min_lon']['min']
+            max_lon = stats_fields['tile_max_lon']['max']
 
             dataset['spatial_extent'] = '{:0.2f},{:0.2f},{:0.2f},{:0.2f}'.format(min_lon, min_lat, max_lon, max_lat)
 
@@ -277,17 +278,14 @@ class SolrProxy(object):
 
     def find_days_in_range_asc(self, min_lat, max_lat, min_lon, max_lon, ds, start_time, end_time, **kwargs):
 
-        search = 'dataset_s:%s' % ds
-
-        search_start_s = datetime.utcfromtimestamp(start_time).strftime(SOLR_FORMAT)
-        search_end_s = datetime.utcfromtimestamp(end_time).strftime(SOLR_FORMAT)
+        search = f'dataset_s:{ds}'
 
         additionalparams = {
             'fq': [
-                "geo:[%s,%s TO %s,%s]" % (min_lat, min_lon, max_lat, max_lon),
-                "{!frange l=0 u=0}ms(tile_min_time_dt,tile_max_time_dt)",
-                "tile_count_i:[1 TO *]",
-                "tile_min_time_dt:[%s TO %s] " % (search_start_s, search_end_s)
+                f'geo:[{min_lat},{min_lon} TO {max_lat},{max_lon}]',
+                '{!frange l=0 u=0}ms(tile_min_time_dt,tile_max_time_dt)',
+                'tile_count_i:[1 TO *]',
+                f'tile_min_time_dt:[{_to_solr_time(start_time)} TO {_to_solr_time(end_time)}] '
             ],
             'rows': 0,
             'facet': 'true',
@@ -300,9 +298,10 @@ class SolrProxy(object):
 
         response = self.do_query_raw(*(search, None, None, False, None), **additionalparams)
 
-        daysinrangeasc = sorted(
-            [(datetime.strptime(a_date, SOLR_FORMAT) - datetime.utcfromtimestamp(0)).total_seconds() for a_date
-             in response.facets['facet_fields']['tile_min_time_dt'][::2]])
+        # Solr dates are 'YYYY-MM-DDTHH:MM:SSZ'; truncating to 19 characters drops the 'Z' so numpy can parse
+        # the whole facet list in one pass
+        days = np.array(response.facets['facet_fields']['tile_min_time_dt'][::2], dtype='U19').astype('datetime64[s]')
+        daysinrangeasc = np.sort((days - EPOCH_64).astype(np.int64)).tolist()
 
         return daysinrangeasc
 
@@ -319,19 +318,7 @@ class SolrProxy(object):
         }
 
         if 0 <= start_time <= end_time:
-            search_start_s = datetime.utcfromtimestamp(start_time).strftime(SOLR_FORMAT)
-            search_end_s = datetime.utcfromtimestamp(end_time).strftime(SOLR_FORMAT)
-
-            time_clause = "(" \
-                          "tile_min_time_dt:[%s TO %s] " \
-                          "OR tile_max_time_dt:[%s TO %s] " \
-                          "OR (tile_min_time_dt:[* TO %s] AND tile_max_time_dt:[%s TO *])" \
-                          ")" % (
-                              search_start_s, search_end_s,
-                              search_start_s, search_end_s,
-                              search_start_s, search_end_s
-                          )
-            additionalparams['fq'].append(time_clause)
+            additionalparams['fq'].append(self.get_formatted_time_clause(start_time, end_time))
 
         self._merge_kwargs(additionalparams, **kwargs)
 
@@ -353,19 +340,7 @@ class SolrProxy(object):
         }
 
         if 0 <= start_time <= end_time:
-            search_start_s = datetime.utcfromtimestamp(start_time).strftime(SOLR_FORMAT)
-            search_end_s = datetime.utcfromtimestamp(end_time).strftime(SOLR_FORMAT)
-
-            time_clause = "(" \
-                          "tile_min_time_dt:[%s TO %s] " \
-                          "OR tile_max_time_dt:[%s TO %s] " \
-                          "OR (tile_min_time_dt:[* TO %s] AND tile_max_time_dt:[%s TO *])" \
-                          ")" % (
-                              search_start_s, search_end_s,
-                              search_start_s, search_end_s,
-                              search_start_s, search_end_s
-                          )
-            additionalparams['fq'].append(time_clause)
+            additionalparams['fq'].append(self.get_formatted_time_clause(start_time, end_time))
 
         self._merge_kwargs(additionalparams, **kwargs)
 
@@ -387,19 +362,7 @@ class SolrProxy(object):
         }
 
         if 0 <= start_time <= end_time:
-            search_start_s = datetime.utcfromtimestamp(start_time).strftime(SOLR_FORMAT)
-            search_end_s = datetime.utcfromtimestamp(end_time).strftime(SOLR_FORMAT)
-
-            time_clause = "(" \
-                          "tile_min_time_dt:[%s TO %s] " \
-                          "OR tile_max_time_dt:[%s TO %s] " \
-                          "OR (tile_min_time_dt:[* TO %s] AND tile_max_time_dt:[%s TO *])" \
-                          ")" % (
-                              search_start_s, search_end_s,
-                              search_start_s, search_end_s,
-                              search_start_s, search_end_s
-                          )
-            additionalparams['fq'].append(time_clause)
+            additionalparams['fq'].append(self.get_formatted_time_clause(start_time, end_time))
 
         self._merge_kwargs(additionalparams, **kwargs)
 
@@ -426,19 +389,7 @@ class SolrProxy(object):
         }
 
         if 0 <= start_time <= end_time:
-            search_start_s = datetime.utcfromtimestamp(start_time).strftime(SOLR_FORMAT)
-            search_end_s = datetime.utcfromtimestamp(end_time).strftime(SOLR_FORMAT)
-
-            time_clause = "(" \
-                          "tile_min_time_dt:[%s TO %s] " \
-                          "OR tile_max_time_dt:[%s TO %s] " \
-                          "OR (tile_min_time_dt:[* TO %s] AND tile_max_time_dt:[%s TO *])" \
-                          ")" % (
-                              search_start_s, search_end_s,
-                              search_start_s, search_end_s,
-                              search_start_s, search_end_s
-                          )
-            additionalparams['fq'].append(time_clause)
+            additionalparams['fq'].append(self.get_formatted_time_clause(start_time, end_time))
 
         self._merge_kwargs(additionalparams, **kwargs)
 
@@ -463,19 +414,7 @@ class SolrProxy(object):
         }
 
         if 0 <= start_time <= end_time:
-            search_start_s = datetime.utcfromtimestamp(start_time).strftime(SOLR_FORMAT)
-            search_end_s = datetime.utcfromtimestamp(end_time).strftime(SOLR_FORMAT)
-
-            time_clause = "(" \
-                          "tile_min_time_dt:[%s TO %s] " \
-                          "OR tile_max_time_dt:[%s TO %s] " \
-                          "OR (tile_min_time_dt:[* TO %s] AND tile_max_time_dt:[%s TO *])" \
-                          ")" % (
-                              search_start_s, search_end_s,
-                              search_start_s, search_end_s,
-                              search_start_s, search_end_s
-                          )
-            additionalparams['fq'].append(time_clause)
+            additionalparams['fq'].append(self.get_formatted_time_clause(start_time, end_time))
 
         self._merge_kwargs(additionalparams, **kwargs)
 
@@ -486,7 +425,7 @@ class SolrProxy(object):
     def find_all_tiles_in_box_at_time(self, min_lat, max_lat, min_lon, max_lon, ds, search_time, **kwargs):
         search = 'dataset_s:%s' % ds
 
-        the_time = datetime.utcfromtimestamp(search_time).strftime(SOLR_FORMAT)
+        the_time = _to_solr_time(search_time)
         time_clause = "(" \
                       "tile_min_time_dt:[* TO %s] " \
                       "AND tile_max_time_dt:[%s TO *] " \
@@ -509,7 +448,7 @@ class SolrProxy(object):
     def find_all_tiles_in_polygon_at_time(self, bounding_polygon, ds, search_time, **kwargs):
         search = 'dataset_s:%s' % ds
 
-        the_time = datetime.utcfromtimestamp(search_time).strftime(SOLR_FORMAT)
+        the_time = _to_solr_time(search_time)
         time_clause = "(" \
                       "tile_min_time_dt:[* TO %s] " \
                       "AND tile_max_time_dt:[%s TO *] " \
@@ -534,7 +473,7 @@ class SolrProxy(object):
     def find_all_tiles_within_box_at_time(self, min_lat, max_lat, min_lon, max_lon, ds, time, **kwargs):
         search = 'dataset_s:%s' % ds
 
-        the_time = datetime.utcfromtimestamp(time).strftime(SOLR_FORMAT)
+        the_time = _to_solr_time(time)
         time_clause = "(" \
                       "tile_min_time_dt:[* TO %s] " \
                       "AND tile_max_time_dt:[%s TO *] " \
@@ -558,7 +497,7 @@ class SolrProxy(object):
     def find_all_boundary_tiles_at_time(self, min_lat, max_lat, min_lon, max_lon, ds, time, **kwargs):
         search = 'dataset_s:%s' % ds
 
-        the_time = datetime.utcfromtimestamp(time).strftime(SOLR_FORMAT)
+        the_time = _to_solr_time(time)
         time_clause = "(" \
                       "tile_min_time_dt:[* TO %s] " \
                       "AND tile_max_time_dt:[%s TO *] " \
@@ -606,8 +545,8 @@ class SolrProxy(object):
             **additionalparams)
 
     def get_formatted_time_clause(self, start_time, end_time):
-        search_start_s = datetime.utcfromtimestamp(start_time).strftime(SOLR_FORMAT)
-        search_end_s = datetime.utcfromtimestamp(end_time).strftime(SOLR_FORMAT)
+        search_start_s = _to_solr_time(start_time)
+        search_end_s = _to_solr_time(end_time)
 
         time_clause = "(" \
                       "tile_min_time_dt:[%s TO %s] " \
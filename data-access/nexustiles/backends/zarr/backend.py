@@ -14,7 +14,9 @@
 # limitations under the License.
 
 import logging
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from urllib.parse import urlparse
 
@@ -38,6 +40,23 @@ logging.basicConfig(
     datefmt="%Y-%m-%dT%H:%M:%S", stream=sys.stdout)
 logger = logging.getLogger(__name__)
 
+DEFAULT_FETCH_WORKERS = 16
+
+
+def _fetch_workers():
+    value = os.environ.get('ZARR_FETCH_WORKERS', DEFAULT_FETCH_WORKERS)
+
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+
+    if workers < 1:
+        logger.warning(f'Invalid ZARR_FETCH_WORKERS value {value!r}, using {DEFAULT_FETCH_WORKERS}')
+        workers = DEFAULT_FETCH_WORKERS
+
+    return workers
+
 
 class ZarrBackend(AbstractTileService):
     def __init__(self, dataset_name, path, config=None):
@@ -77,6 +96,10 @@ class ZarrBackend(AbstractTileService):
 
         self.__depth = config['coords'].get('depth')
 
+        # Tile subsets are independent, I/O-bound reads, so they are fetched concurrently
+        fetch_workers = _fetch_workers()
+        s3_max_pool_connections = 2 * fetch_workers
+
         if self.__store_type in ['', 'file']:
             store = self.__path
         elif self.__store_type == 's3':
@@ -86,10 +109,11 @@ class ZarrBackend(AbstractTileService):
                 if aws_cfg['public']:
                     # region = aws_cfg.get('region', 'us-west-2')
                     # store = f'https://{self.__host}.s3.{region}.amazonaws.com{self.__path}'
-                    s3 = s3fs.S3FileSystem(True)
+                    s3 = s3fs.S3FileSystem(True, config_kwargs={'max_pool_connections': s3_max_pool_connections})
                     store = s3fs.S3Map(root=path, s3=s3, check=False)
                 else:
-                    s3 = s3fs.S3FileSystem(False, key=aws_cfg['accessKeyID'], secret=aws_cfg['secretAccessKey'])
+                    s3 = s3fs.S3FileSystem(False, key=aws_cfg['accessKeyID'], secret=aws_cfg['secretAccessKey'],
+                                           config_kwargs={'max_pool_connections': s3_max_pool_connections})
                     store = s3fs.S3Map(root=path, s3=s3, check=False)
             except Exception as e:
                 logger.error(f'Failed to open zarr dataset at {self.__path}, ignoring it. Cause: {e}')
@@ -110,6 +134,8 @@ class ZarrBackend(AbstractTileService):
             logger.warning(f'Latitude coordinate for {self._name} is in descending order. Flipping it to ascending')
             self.__ds = self.__ds.isel({self.__latitude: slice(None, None, -1)})
 
+        self.__fetch_pool = ThreadPoolExecutor(max_workers=fetch_workers)
+
     def get_dataseries_list(self, simple=False):
         ds = {
             "shortName": self._name,
@@ -387,8 +413,8 @@ class ZarrBackend(AbstractTileService):
         raise NotImplementedError()
 
     def fetch_data_for_tiles(self, *tiles):
-        for tile in tiles:
-            self.__fetch_data_for_tile(tile)
+        # Consume the results so exceptions raised in the workers propagate here
+        list(self.__fetch_pool.map(self.__fetch_data_for_tile, tiles))
 
         return tiles
 
@@ -441,6 +467,10 @@ class ZarrBackend(AbstractTileService):
         if sel_t is not None:
             matched = matched.sel(sel_t, method=method)
 
+        # Load every requested variable in a single compute. This runs in a fetch pool worker, which already
+        # provides the concurrency, so dask runs synchronously here rather than starting a pool per thread
+        matched = matched[self.__variables].load(scheduler='synchronous')
+
         tile.latitudes = ma.masked_invalid(matched[self.__latitude].to_numpy())
         tile.longitudes = ma.masked_invalid(matched[self.__longitude].to_numpy())
 
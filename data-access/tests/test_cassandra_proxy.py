@@ -0,0 +1,111 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+from nexustiles.backends.nexusproto.dao.CassandraProxy import NexusTileData
+
+
+def reference_to_standard_index(data_array, desired_shape, is_multi_var=False):
+    # Previous np.indices based implementation of NexusTileData._to_standard_index
+    reshaped_array = []
+    if is_multi_var:
+        reshaped_data_array = np.moveaxis(data_array, -1, 0)
+    else:
+        reshaped_data_array = [data_array]
+
+    for variable_data_array in reshaped_data_array:
+        if desired_shape[0] == 1:
+            variable_reshaped_array = np.ma.masked_all((desired_shape[1], desired_shape[2]))
+        else:
+            variable_reshaped_array = np.ma.masked_all(desired_shape)
+
+        row, col = np.indices(variable_data_array.shape)
+
+        variable_reshaped_array[
+            np.diag_indices(desired_shape[1], len(variable_reshaped_array.shape))] = \
+            variable_data_array[
+                row.flat, col.flat]
+        variable_reshaped_array.mask[
+            np.diag_indices(desired_shape[1], len(variable_reshaped_array.shape))] = \
+            variable_data_array.mask[
+                row.flat, col.flat]
+
+        if desired_shape[0] == 1:
+            reshaped_array.append(variable_reshaped_array[np.newaxis, :])
+        else:
+            reshaped_array.append(variable_reshaped_array)
+
+    if not is_multi_var:
+        reshaped_array = reshaped_array[0]
+
+    return reshaped_array
+
+
+def reference_to_time_series_index(data_array, desired_shape, idx):
+    # Previous masked item assignment used for time series tiles
+    reshaped_array = np.ma.masked_all(desired_shape)
+    reshaped_array[:, idx, idx] = data_array
+    return reshaped_array
+
+
+def masked_with_nan(shape):
+    data = np.arange(np.prod(shape), dtype=np.float32).reshape(shape)
+    data[0, 0] = np.nan
+    return np.ma.masked_invalid(data)
+
+
+class TestReshape(unittest.TestCase):
+    def assertMaskedEqual(self, expected, actual):
+        self.assertEqual(expected.shape, actual.shape)
+        self.assertEqual(expected.dtype, actual.dtype)
+        np.testing.assert_array_equal(np.ma.getmaskarray(expected), np.ma.getmaskarray(actual))
+        np.testing.assert_array_equal(expected.compressed(), actual.compressed())
+
+    def test_standard_index_single_time(self):
+        # Swath data is (time, point) with the points along the diagonal
+        data = masked_with_nan((1, 6))
+        desired_shape = (1, 6, 6)
+
+        self.assertMaskedEqual(reference_to_standard_index(data, desired_shape),
+                               NexusTileData._to_standard_index(data, desired_shape))
+
+    def test_standard_index_many_times(self):
+        data = masked_with_nan((1, 6))
+        desired_shape = (6, 6, 6)
+
+        self.assertMaskedEqual(reference_to_standard_index(data, desired_shape),
+                               NexusTileData._to_standard_index(data, desired_shape))
+
+    def test_standard_index_multi_var(self):
+        data = np.ma.masked_invalid(np.stack([masked_with_nan((1, 6)).filled(np.nan),
+                                              masked_with_nan((1, 6)).filled(np.nan) * 2], axis=-1))
+
+        for desired_shape in [(1, 6, 6), (6, 6, 6)]:
+            expected = reference_to_standard_index(data, desired_shape, is_multi_var=True)
+            actual = NexusTileData._to_standard_index(data, desired_shape, is_multi_var=True)
+
+            self.assertEqual(len(expected), len(actual))
+            for expected_var, actual_var in zip(expected, actual):
+                self.assertMaskedEqual(expected_var, actual_var)
+
+    def test_time_series_index(self):
+        data = masked_with_nan((3, 4))
+        desired_shape = (3, 4, 4)
+        idx = np.arange(4)
+
+        self.assertMaskedEqual(reference_to_time_series_index(data, desired_shape, idx),
+                               NexusTileData._to_time_series_index(data, desired_shape, idx))
@@ -0,0 +1,58 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from nexustiles.backends.nexusproto.dao.SolrProxy import SolrProxy, SOLR_FORMAT
+
+
+class TestFindDaysInRangeAsc(unittest.TestCase):
+    def setUp(self):
+        # Skip __init__ so no Solr connection is made; only do_query_raw is used
+        self.proxy = SolrProxy.__new__(SolrProxy)
+
+    def find_days(self, facet_field):
+        response = mock.Mock()
+        response.facets = {'facet_fields': {'tile_min_time_dt': facet_field}}
+
+        with mock.patch.object(self.proxy, 'do_query_raw', return_value=response) as do_query_raw:
+            days = self.proxy.find_days_in_range_asc(-10, 10, -20, 20, 'test_ds', 0, 1700000000)
+
+        params = do_query_raw.call_args.kwargs
+        self.assertIn('tile_min_time_dt:[1970-01-01T00:00:00Z TO 2023-11-14T22:13:20Z] ', params['fq'])
+        self.assertIn('geo:[-10,-20 TO 10,20]', params['fq'])
+
+        return days
+
+    def test_days_are_sorted_epoch_seconds(self):
+        facet_field = [
+            '2020-01-03T00:00:00Z', 12,
+            '1969-12-31T12:00:00Z', 3,
+            '2020-01-01T00:00:00Z', 7,
+        ]
+
+        days = self.find_days(facet_field)
+
+        expected = sorted(
+            (datetime.strptime(a_date, SOLR_FORMAT) - datetime.utcfromtimestamp(0)).total_seconds()
+            for a_date in facet_field[::2]
+        )
+        self.assertEqual(expected, days)
+        self.assertEqual([-43200, 1577836800, 1578009600], days)
+
+    def test_no_days(self):
+        self.assertEqual([], self.find_days([]))
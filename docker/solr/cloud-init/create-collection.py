@@ -18,8 +18,10 @@
 import os
 import requests
 import requests.exceptions
+from requests.adapters import HTTPAdapter
 import json
 import json.decoder
+import signal
 import time
 import sys
 import logging
@@ -34,15 +36,36 @@ ZK_LOCK_GUID = os.environ["ZK_LOCK_GUID"]
 MINIMUM_NODES = int(os.environ["MINIMUM_NODES"])
 CREATE_COLLECTION_PARAMS = os.environ["CREATE_COLLECTION_PARAMS"]
 
+# (name, type) of the explicit fields added to the nexustiles schema
+SCHEMA_FIELDS = [
+    ('geo', 'geo'),
+    ('tile_max_lat', 'pdouble'),
+    ('tile_min_lat', 'pdouble'),
+    ('tile_max_lon', 'pdouble'),
+    ('tile_min_lon', 'pdouble'),
+]
+
+# Reuse one connection to Solr for the status polling and collection setup requests
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+
+def list_collections():
+    try:
+        return SESSION.get("{}admin/collections?action=LIST".format(SDAP_SOLR_URL), timeout=5).json()['collections']
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, json.decoder.JSONDecodeError, KeyError):
+        return None
+
 
 def get_cluster_status():
     try:
-        return requests.get("{}admin/collections?action=CLUSTERSTATUS".format(SDAP_SOLR_URL)).json()
-    except (requests.exceptions.ConnectionError, json.decoder.JSONDecodeError):
+        return SESSION.get("{}admin/collections?action=CLUSTERSTATUS".format(SDAP_SOLR_URL), timeout=5).json()
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, json.decoder.JSONDecodeError):
         return False
 
 
-logging.info("Attempting to aquire lock from {}".format(SDAP_ZK_SOLR))
+logging.info("Attempting to aquire lock from %s", SDAP_ZK_SOLR)
 zk_host, zk_chroot = SDAP_ZK_SOLR.split('/')
 zk = KazooClient(hosts=zk_host)
 zk.start()
@@ -51,40 +74,44 @@ zk.chroot = zk_chroot
 lock = zk.Lock("/collection-creator", ZK_LOCK_GUID)
 try:
     with lock:  # blocks waiting for lock acquisition
-        logging.info("Lock aquired. Checking for SolrCloud at {}".format(SDAP_SOLR_URL))
+        logging.info("Lock aquired. Checking for SolrCloud at %s", SDAP_SOLR_URL)
         # Wait for MAX_RETRIES for the entire Solr cluster to be available.
         attempts = 0
-        status = None
         collection_exists = False
         while attempts <= MAX_RETRIES:
-            status = get_cluster_status()
-            if not status:
-                # If we can't get the cluster status, my Solr node is not running
+            # LIST is a much smaller response than CLUSTERSTATUS, so use it to check for the collection first
+            collections = list_collections()
+            if collections is None:
+                # If we can't list the collections, my Solr node is not running
                 attempts += 1
-                logging.info("Waiting for Solr at {}".format(SDAP_SOLR_URL))
+                logging.info("Waiting for Solr at %s", SDAP_SOLR_URL)
                 time.sleep(1)
                 continue
+            elif 'nexustiles' in collections:
+                # Collection already exists. Break out of the while loop
+                collection_exists = True
+                logging.info("nexustiles collection already exists.")
+                break
             else:
-                # If we can get the cluster status, at least my Solr node is running
-                # We can check if the collection exists already now
-                if 'collections' in status['cluster'] and 'nexustiles' in status['cluster']['collections']:
-                    # Collection already exists. Break out of the while loop
-                    collection_exists = True
-                    logging.info("nexustiles collection already exists.")
-                    break
+                # Collection does not exist, but need to make sure number of expected nodes are running
+                status = get_cluster_status()
+                if not status:
+                    attempts += 1
+                    logging.info("Waiting for Solr at %s", SDAP_SOLR_URL)
+                    time.sleep(1)
+                    continue
+
+                live_nodes = status['cluster']['live_nodes']
+                if len(live_nodes) < MINIMUM_NODES:
+                    # Not enough live nodes
+                    logging.info("Found %s live node(s). Expected at least %s. Live nodes: %s", len(live_nodes), MINIMUM_NODES, live_nodes)
+                    attempts += 1
+                    time.sleep(1)
+                    continue
                 else:
-                    # Collection does not exist, but need to make sure number of expected nodes are running
-                    live_nodes = status['cluster']['live_nodes']
-                    if len(live_nodes) < MINIMUM_NODES:
-                        # Not enough live nodes
-                        logging.info("Found {} live node(s). Expected at least {}. Live nodes: {}".format(len(live_nodes), MINIMUM_NODES, live_nodes))
-                        attempts += 1
-                        time.sleep(1)
-                        continue
-                    else:
-                        # We now have a full cluster, ready to create collection.
-                        logging.info("Detected full cluster of at least {} nodes. Checking for nexustiles collection".format(MINIMUM_NODES))
-                        break
+                    # We now have a full cluster, ready to create collection.
+                    logging.info("Detected full cluster of at least %s nodes. Checking for nexustiles collection", MINIMUM_NODES)
+                    break
 
         # Make sure we didn't exhaust our retries
         if attempts > MAX_RETRIES:
@@ -94,11 +121,11 @@ try:
         if not collection_exists:
             # Collection does not exist, create it.
             create_command = "{}admin/collections?action=CREATE&{}".format(SDAP_SOLR_URL, CREATE_COLLECTION_PARAMS)
-            logging.info("Creating collection with command {}".format(create_command))
-            create_response = requests.get(create_command).json()
+            logging.info("Creating collection with command %s", create_command)
+            create_response = SESSION.get(create_command).json()
             if 'failure' not in create_response:
                 # Collection created, we're done.
-                logging.info("Collection created. {}".format(create_response))
+                logging.info("Collection created. %s", create_response)
                 pass
             else:
                 # Some error occured while creating the collection
@@ -106,7 +133,9 @@ try:
 
             schema_api = "{}nexustiles/schema".format(SDAP_SOLR_URL)
 
-            field_type_payload = json.dumps({
+            # The Schema API applies the commands of a single request in order, so the field type is created
+            # before the fields that use it, and the schema is only reloaded once
+            schema_payload = json.dumps({
                 "add-field-type": {
                     "name": "geo",
                     "class": "solr.SpatialRecursivePrefixTreeFieldType",
@@ -116,38 +145,22 @@ try:
                     "spatialContextFactory": "com.spatial4j.core.context.jts.JtsSpatialContextFactory",
                     "precisionScale": "1000",
                     "distErrPct": "0.025",
-                    "distanceUnits": "degrees"}})
+                    "distanceUnits": "degrees"},
+                "add-field": [{"name": name, "type": field_type} for name, field_type in SCHEMA_FIELDS]})
 
-            logging.info("Creating field-type 'geo'...")
-            field_type_response = requests.post(url=schema_api, data=field_type_payload)
-            if field_type_response.status_code < 400:
+            logging.info("Creating field-type 'geo' and tile fields...")
+            schema_response = SESSION.post(url=schema_api, data=schema_payload)
+            if schema_response.status_code < 400:
                 logging.info("Success.")
             else:
-                logging.error("Error creating field type 'geo': {}".format(field_type_response.text))
-
-            def add_field(schema_api, name, type):
-                field_payload = json.dumps({
-                    "add-field": {
-                        "name": name,
-                        "type": type}})
-                logging.info(f"Creating {type} field '{name}'...")
-                field_response = requests.post(url=schema_api, data=field_payload)
-                if field_response.status_code < 400:
-                    logging.info("Success.")
-                else:
-                    logging.error(f"Error creating field '{name}': {field_response.text}")
-
-            add_field(schema_api, 'geo', 'geo')
-            add_field(schema_api, 'tile_max_lat', 'pdouble')
-            add_field(schema_api, 'tile_min_lat', 'pdouble')
-            add_field(schema_api, 'tile_max_lon', 'pdouble')
-            add_field(schema_api, 'tile_min_lon', 'pdouble')
+                logging.error("Error updating schema: %s", schema_response.text)
 
 finally:
     zk.stop()
     zk.close()
 
-# We're done, do nothing forever.
+# We're done, block until the container is stopped. The script runs as PID 1, which ignores SIGTERM
+# unless a handler is installed.
 logging.info("Done.")
-while True:
-    time.sleep(987654321)
+signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+signal.pause()